@@ -21,6 +21,7 @@
 #define DEVICE
 #define HOSTDEVICE
 #include <iostream>
+#include <pybind11/numpy.h>
 #if !defined(__HIPCC__) && defined(__SSE__)
 #include <immintrin.h>
 #endif
@@ -150,20 +151,47 @@ struct PolyhedronVertices : ShapeParams
     PolyhedronVertices(pybind11::dict v, bool managed = false)
         : PolyhedronVertices((unsigned int)pybind11::len(v["vertices"]), managed)
         {
-        pybind11::list verts = v["vertices"];
         ignore = v["ignore_statistics"].cast<unsigned int>();
 
-        // extract the verts from the python list
         std::vector<vec3<OverlapReal>> vert_vector;
-        for (unsigned int i = 0; i < pybind11::len(verts); i++)
+        if (pybind11::isinstance<pybind11::array>(v["vertices"]))
             {
-            pybind11::list verts_i = verts[i];
-            if (len(verts_i) != 3)
+            // read contiguous (N, 3) arrays directly from the buffer
+            auto verts = pybind11::array_t<double, pybind11::array::c_style
+                                                       | pybind11::array::forcecast>::
+                ensure(v["vertices"]);
+            if (!verts)
+                {
+                // ensure() leaves the python error set when the conversion fails
+                PyErr_Clear();
+                throw std::runtime_error("Vertices must be convertible to float64");
+                }
+            if (verts.ndim() != 2 || verts.shape(1) != 3)
                 throw std::runtime_error("Each vertex must have 3 elements");
-            vec3<OverlapReal> vert = vec3<OverlapReal>(pybind11::cast<OverlapReal>(verts_i[0]),
-                                                       pybind11::cast<OverlapReal>(verts_i[1]),
-                                                       pybind11::cast<OverlapReal>(verts_i[2]));
-            vert_vector.push_back(vert);
+            const double* data = verts.data();
+            vert_vector.reserve(verts.shape(0));
+            for (pybind11::ssize_t i = 0; i < verts.shape(0); i++)
+                {
+                vert_vector.push_back(vec3<OverlapReal>(static_cast<OverlapReal>(data[3 * i]),
+                                                        static_cast<OverlapReal>(data[3 * i + 1]),
+                                                        static_cast<OverlapReal>(data[3 * i + 2])));
+                }
+            }
+        else
+            {
+            // extract the verts from the python list
+            pybind11::list verts = v["vertices"];
+            for (unsigned int i = 0; i < pybind11::len(verts); i++)
+                {
+                pybind11::list verts_i = verts[i];
+                if (len(verts_i) != 3)
+                    throw std::runtime_error("Each vertex must have 3 elements");
+                vec3<OverlapReal> vert
+                    = vec3<OverlapReal>(pybind11::cast<OverlapReal>(verts_i[0]),
+                                        pybind11::cast<OverlapReal>(verts_i[1]),
+                                        pybind11::cast<OverlapReal>(verts_i[2]));
+                vert_vector.push_back(vert);
+                }
             }
 
         setVerts(vert_vector, v["sweep_radius"].cast<float>());
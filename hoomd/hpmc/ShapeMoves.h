@@ -14,6 +14,7 @@
 #include <pybind11/stl.h>
 
 #include <cmath>
+#include <cstdint>
 
 namespace hoomd
     {
@@ -124,9 +125,45 @@ template<typename Shape> class ShapeMoveBase
 
     }; // end class ShapeMoveBase
 
+namespace detail
+    {
+//! Build a polyhedron from a flat buffer of n values (n / 3 vertices with stride 3)
+inline void setShapeFromBuffer(PolyhedronVertices& shape, const double* buffer, int n)
+    {
+    if (n < 3 || n % 3 != 0)
+        {
+        throw std::runtime_error(
+            "Compiled callback must output 3 values per vertex and at least one vertex.");
+        }
+    std::vector<vec3<OverlapReal>> verts(n / 3);
+    for (int i = 0; i < n / 3; i++)
+        {
+        verts[i] = vec3<OverlapReal>(static_cast<OverlapReal>(buffer[3 * i]),
+                                     static_cast<OverlapReal>(buffer[3 * i + 1]),
+                                     static_cast<OverlapReal>(buffer[3 * i + 2]));
+        }
+    shape.setVerts(verts, shape.sweep_radius);
+    }
+
+//! Build an ellipsoid from a flat buffer holding the semi-axes (a, b, c)
+inline void setShapeFromBuffer(EllipsoidParams& shape, const double* buffer, int n)
+    {
+    if (n != 3)
+        {
+        throw std::runtime_error("Compiled callback must output the 3 ellipsoid semi-axes.");
+        }
+    shape.x = static_cast<OverlapReal>(buffer[0]);
+    shape.y = static_cast<OverlapReal>(buffer[1]);
+    shape.z = static_cast<OverlapReal>(buffer[2]);
+    }
+    } // end namespace detail
+
 template<typename Shape> class PythonShapeMove : public ShapeMoveBase<Shape>
     {
     public:
+    //! Signature of compiled callbacks: (type_id, params, n_params, output, n_output)
+    typedef void (*raw_callback_type)(int, const double*, int, double*, int*);
+
     PythonShapeMove(std::shared_ptr<SystemDefinition> sysdef,
                     std::shared_ptr<IntegratorHPMCMono<Shape>> mc)
         : ShapeMoveBase<Shape>(sysdef, mc)
@@ -145,6 +182,7 @@ template<typename Shape> class PythonShapeMove : public ShapeMoveBase<Shape>
                       typename Shape::param_type& shape,
                       hoomd::RandomGenerator& rng)
         {
+        bool changed = false;
         for (unsigned int i = 0; i < m_params[type_id].size(); i++)
             {
             Scalar stepsize = this->m_step_size[type_id];
@@ -154,17 +192,47 @@ template<typename Shape> class PythonShapeMove : public ShapeMoveBase<Shape>
             Scalar r = hoomd::detail::generate_canonical<double>(rng);
             Scalar x = (r < this->m_move_probability) ? uniform(rng) : 0.0;
             m_params[type_id][i] += x;
+            changed = changed || x != 0.0;
+            }
+        if (changed)
+            {
+            m_params_revision++;
+            }
+        if (m_raw_callback)
+            {
+            // call the compiled function directly, bypassing the python interpreter
+            m_raw_input.assign(m_params[type_id].begin(), m_params[type_id].end());
+            int n_output = 0;
+            m_raw_callback(static_cast<int>(type_id),
+                           m_raw_input.data(),
+                           static_cast<int>(m_raw_input.size()),
+                           m_raw_output.data(),
+                           &n_output);
+            // this only validates the reported count so that it is never read past the end
+            // of the buffer. It can not detect callbacks that write past output_size.
+            if (n_output < 0 || static_cast<size_t>(n_output) > m_raw_output.size())
+                {
+                throw std::runtime_error(
+                    "Compiled callback reported more values than output_size.");
+                }
+            detail::setShapeFromBuffer(shape, m_raw_output.data(), n_output);
+            }
+        else
+            {
+            pybind11::object d = m_python_callback(type_id, m_params[type_id]);
+            pybind11::dict shape_dict = pybind11::cast<pybind11::dict>(d);
+            shape = typename Shape::param_type(shape_dict);
             }
-        pybind11::object d = m_python_callback(type_id, m_params[type_id]);
-        pybind11::dict shape_dict = pybind11::cast<pybind11::dict>(d);
-        shape = typename Shape::param_type(shape_dict);
         }
 
     void retreat(uint64_t timestep, unsigned int type)
         {
         // move has been rejected.
-        m_params[type] = m_params_backup[type];
-
+        if (m_params[type] != m_params_backup[type])
+            {
+            m_params[type] = m_params_backup[type];
+            m_params_revision++;
+            }
         }
 
     pybind11::list getParams(std::string typ)
@@ -189,6 +257,13 @@ template<typename Shape> class PythonShapeMove : public ShapeMoveBase<Shape>
             m_params[type_id][i] = params[i].cast<Scalar>();
             m_params_backup[type_id][i] = params[i].cast<Scalar>();
             }
+        m_params_revision++;
+        }
+
+    //! Number of times the parameters have changed, used to invalidate cached copies
+    unsigned int getParamsRevision()
+        {
+        return m_params_revision;
         }
 
     pybind11::object getCallback()
@@ -199,15 +274,45 @@ template<typename Shape> class PythonShapeMove : public ShapeMoveBase<Shape>
     void setCallback(pybind11::object python_callback)
         {
         m_python_callback = python_callback;
+        m_raw_callback = nullptr;
+        }
+
+    //! Call the compiled function at the given address instead of the python callback
+    void setRawCallback(uintptr_t address)
+        {
+        if (m_raw_output.empty())
+            {
+            throw std::runtime_error("output_size must be set for compiled callbacks.");
+            }
+        m_raw_callback = reinterpret_cast<raw_callback_type>(address);
+        }
+
+    unsigned int getOutputSize()
+        {
+        return static_cast<unsigned int>(m_raw_output.size());
+        }
+
+    void setOutputSize(unsigned int output_size)
+        {
+        if (m_raw_callback && output_size == 0)
+            {
+            throw std::runtime_error("output_size must be set for compiled callbacks.");
+            }
+        m_raw_output.resize(output_size);
         }
 
     private:
     std::vector<std::vector<Scalar>>
         m_params_backup;                       
     std::vector<std::vector<Scalar>> m_params; 
+    unsigned int m_params_revision = 0;
     
     // params.
     pybind11::object m_python_callback;
+
+    raw_callback_type m_raw_callback = nullptr; // compiled callback, replaces m_python_callback
+    std::vector<double> m_raw_input;            // flat buffer of shape parameters
+    std::vector<double> m_raw_output;           // flat buffer of shape definition values
     };
 
 class ConvexPolyhedronVertexShapeMove : public ShapeMoveBase<ShapeConvexPolyhedron>
@@ -588,7 +693,9 @@ class ElasticShapeMove<ShapeConvexPolyhedron> : public ElasticShapeMoveBase<Shap
         {
         unsigned int typid = this->getValidateType(typ);
         param_type shape = param_type(v, false);
-        auto current_shape = this->m_mc->getParams()[typid];
+        // the reference shape is converted once here and stored in C++, moves and energy
+        // evaluations only use m_F and m_volume; avoid a deep copy of the integrator shape
+        const param_type& current_shape = this->m_mc->getParams()[typid];
         if (current_shape.N != shape.N)
             {
             throw std::runtime_error(
@@ -815,9 +922,14 @@ template<class Shape> void export_PythonShapeMove(pybind11::module& m, const std
                       &PythonShapeMove<Shape>::setMoveProbability)
         .def("getParams", &PythonShapeMove<Shape>::getParams)
         .def("setParams", &PythonShapeMove<Shape>::setParams)
+        .def_property_readonly("params_revision", &PythonShapeMove<Shape>::getParamsRevision)
         .def_property("callback",
                       &PythonShapeMove<Shape>::getCallback,
-                      &PythonShapeMove<Shape>::setCallback);
+                      &PythonShapeMove<Shape>::setCallback)
+        .def("setRawCallback", &PythonShapeMove<Shape>::setRawCallback)
+        .def_property("output_size",
+                      &PythonShapeMove<Shape>::getOutputSize,
+                      &PythonShapeMove<Shape>::setOutputSize);
     }
 
 inline void export_ConvexPolyhedronVertexShapeMove(pybind11::module& m, const std::string& name)
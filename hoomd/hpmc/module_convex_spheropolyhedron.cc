@@ -45,9 +45,9 @@ void export_convex_spheropolyhedron(pybind11::module& m)
 
     export_MassProperties<ShapeSpheropolyhedron>(m, "MassPropertiesConvexSpheropolyhedron");
 
-    export_UpdaterShape<ShapeSpheropolyhedron>(m, "UpdaterShapeSpheropolyhedron");
+    export_UpdaterShape<ShapeSpheropolyhedron>(m, "UpdaterShapeConvexSpheropolyhedron");
     export_ShapeMoveBase<ShapeSpheropolyhedron>(m, "ShapeMoveBaseShapeSpheropolyhedron");
-    export_PythonShapeMove<ShapeSpheropolyhedron>(m, "ShapeSpaceSpheropolyhedron");
+    export_PythonShapeMove<ShapeSpheropolyhedron>(m, "ShapeSpaceConvexSpheropolyhedron");
 
     export_ExternalFieldInterface<ShapeSpheropolyhedron>(m, "ExternalFieldSpheropolyhedron");
     export_HarmonicField<ShapeSpheropolyhedron>(m, "ExternalFieldHarmonicSpheropolyhedron");
@@ -1,6 +1,7 @@
 # Copyright (c) 2009-2022 The Regents of the University of Michigan.
 # Part of HOOMD-blue, released under the BSD 3-Clause License.
 
+import ctypes
 import hoomd
 import hoomd.conftest
 from hoomd import hpmc
@@ -243,6 +244,225 @@ def test_python_callback_shape_move(simulation_factory,
     assert np.allclose(updater.particle_volumes, 4 * np.pi / 3)
 
 
+def _scale_unit_ellipsoid(type_id, params, n_params, output, n_output):
+    """Squash a unit sphere into an ellipsoid with the same volume."""
+    x = params[0]
+    b = (1 / x)**(1 / 3)
+    output[0] = x * b
+    output[1] = b
+    output[2] = b
+    n_output[0] = 3
+
+
+def _python_scale_unit_ellipsoid(type_id, param_list):
+    """Python counterpart of ``_scale_unit_ellipsoid``."""
+    x = param_list[0]
+    b = (1 / x)**(1 / 3)
+    return dict(a=x * b, b=b, c=b, ignore_statistics=True)
+
+
+def _scale_cube(type_id, params, n_params, output, n_output):
+    """Compiled callback scaling the cube vertices by the first parameter."""
+    for i, vert in enumerate(verts):
+        for j in range(3):
+            output[3 * i + j] = params[0] * vert[j]
+    n_output[0] = 3 * len(verts)
+
+
+class CtypesCallback:
+    """Expose a python function as a C function pointer like numba.cfunc."""
+
+    signature = ctypes.CFUNCTYPE(None, ctypes.c_int,
+                                 ctypes.POINTER(ctypes.c_double), ctypes.c_int,
+                                 ctypes.POINTER(ctypes.c_double),
+                                 ctypes.POINTER(ctypes.c_int))
+
+    def __init__(self, function):
+        # keep a reference so the function pointer stays valid
+        self._cfunc = self.signature(function)
+        self.address = ctypes.cast(self._cfunc, ctypes.c_void_p).value
+
+
+def _compile_callback(kind, function):
+    if kind == "ctypes":
+        return CtypesCallback(function)
+    numba = pytest.importorskip("numba")
+    return numba.cfunc("void(int32, float64*, int32, float64*, int32*)")(
+        function)
+
+
+def _attach_shape_space(simulation_factory, two_particle_snapshot_factory,
+                        move, mc):
+    """Attach move to a two particle simulation integrated with mc."""
+    mc.d["A"] = 0
+    mc.a["A"] = 0
+    updater = hpmc.update.Shape(trigger=1, shape_move=move, nsweeps=2)
+    sim = simulation_factory(two_particle_snapshot_factory(d=10))
+    sim.operations.integrator = mc
+    sim.operations += updater
+    sim.run(0)
+    return sim, updater
+
+
+@pytest.mark.parametrize("kind", ["ctypes", "numba"])
+def test_compiled_callback_shape_move(simulation_factory,
+                                      two_particle_snapshot_factory, kind):
+    """Test ShapeSpace with a compiled callback that squashes spheres \
+           into oblate ellipsoids with constant volume."""
+    move = ShapeSpace(callback=_compile_callback(kind, _scale_unit_ellipsoid),
+                      default_step_size=0.2,
+                      output_size=3,
+                      compiled_callback=True)
+    move.params["A"] = [1]
+
+    mc = hoomd.hpmc.integrate.Ellipsoid()
+    mc.shape["A"] = dict(a=1, b=1, c=1)
+    sim, updater = _attach_shape_space(simulation_factory,
+                                       two_particle_snapshot_factory, move, mc)
+    assert move._attached
+
+    # always attempt a shape move:
+    #  - shape and params should change
+    #  - volume should remain unchanged
+    sim.run(10)
+    assert np.sum(updater.shape_moves) == 20
+    assert not np.allclose(mc.shape["A"]["a"], 1)
+    assert not np.allclose(move.params["A"], [1])
+    assert np.allclose(updater.particle_volumes, 4 * np.pi / 3)
+
+
+def test_type_params(simulation_factory, two_particle_snapshot_factory):
+    """Test that the logged shape parameters are cached until they change."""
+    move = ShapeSpace(callback=_python_scale_unit_ellipsoid,
+                      default_step_size=0.2)
+    move.params["A"] = [1]
+
+    mc = hoomd.hpmc.integrate.Ellipsoid()
+    mc.shape["A"] = dict(a=1, b=1, c=1)
+    sim, updater = _attach_shape_space(simulation_factory,
+                                       two_particle_snapshot_factory, move, mc)
+
+    type_params = move.type_params
+    assert np.allclose(type_params["A"], [1])
+    assert move.type_params["A"] is type_params["A"]
+
+    # the cached values can not be modified
+    with pytest.raises(ValueError):
+        type_params["A"] *= 2
+    with pytest.raises(TypeError):
+        type_params["A"] = None
+
+    # trial moves that do not change the parameters keep the cache
+    move.param_move_probability = 0
+    sim.run(10)
+    assert move.type_params["A"] is type_params["A"]
+
+    # trial moves that change the parameters invalidate the cache
+    move.param_move_probability = 1
+    sim.run(10)
+    assert not np.allclose(move.params["A"], [1])
+    assert np.allclose(move.type_params["A"], move.params["A"])
+
+    # so does setting the parameters from python
+    move.params["A"] = [0.5]
+    assert np.allclose(move.type_params["A"], [0.5])
+
+
+def _array_scale_cube(type_id, param_list):
+    return dict(vertices=np.ascontiguousarray(verts * param_list[0]),
+                sweep_radius=0,
+                ignore_statistics=True)
+
+
+@pytest.mark.parametrize("kind", ["array", "ctypes"])
+def test_polyhedron_callback_shape_move(simulation_factory,
+                                        two_particle_snapshot_factory, kind):
+    """Test ShapeSpace with callbacks defining polyhedron vertices as arrays \
+           and as flat compiled output."""
+
+    if kind == "array":
+        move = ShapeSpace(callback=_array_scale_cube, default_step_size=0.2)
+    else:
+        move = ShapeSpace(callback=CtypesCallback(_scale_cube),
+                          default_step_size=0.2,
+                          output_size=3 * len(verts),
+                          compiled_callback=True)
+    move.params["A"] = [1]
+
+    updater = hpmc.update.Shape(trigger=1, shape_move=move, nsweeps=2)
+
+    mc = hoomd.hpmc.integrate.ConvexPolyhedron()
+    mc.d["A"] = 0
+    mc.a["A"] = 0
+    mc.shape["A"] = dict(vertices=verts)
+
+    sim = simulation_factory(two_particle_snapshot_factory(d=10))
+    sim.operations.integrator = mc
+    sim.operations += updater
+    sim.run(10)
+
+    x = move.params["A"][0]
+    assert np.sum(updater.shape_moves) == 20
+    assert np.allclose(mc.shape["A"]["vertices"], verts * x)
+
+
+def test_compiled_callback_reports_more_than_output_size(
+        simulation_factory, two_particle_snapshot_factory):
+    """Test that a compiled callback reporting more values than output_size \
+           raises an error."""
+
+    def overflow(type_id, params, n_params, output, n_output):
+        n_output[0] = 6 * len(verts)
+
+    move = ShapeSpace(callback=CtypesCallback(overflow),
+                      default_step_size=0.2,
+                      output_size=3 * len(verts),
+                      compiled_callback=True)
+    move.params["A"] = [1]
+
+    updater = hpmc.update.Shape(trigger=1, shape_move=move, nsweeps=2)
+
+    mc = hoomd.hpmc.integrate.ConvexPolyhedron()
+    mc.d["A"] = 0
+    mc.a["A"] = 0
+    mc.shape["A"] = dict(vertices=verts)
+
+    sim = simulation_factory(two_particle_snapshot_factory(d=10))
+    sim.operations.integrator = mc
+    sim.operations += updater
+    with pytest.raises(RuntimeError):
+        sim.run(1)
+
+
+def test_compiled_callback_validation():
+    """Test that compiled callbacks require an address and output_size."""
+    with pytest.raises(ValueError):
+        ShapeSpace(callback=_test_callback,
+                   output_size=3,
+                   compiled_callback=True)
+    with pytest.raises(ValueError):
+        ShapeSpace(callback=CtypesCallback(_scale_unit_ellipsoid),
+                   compiled_callback=True)
+
+    move = ShapeSpace(callback=CtypesCallback(_scale_unit_ellipsoid),
+                      output_size=3,
+                      compiled_callback=True)
+    with pytest.raises(ValueError):
+        move.output_size = 0
+    with pytest.raises(ValueError):
+        move.callback = _test_callback
+
+    # python callbacks are never called through an address
+    class AddressedCallback:
+        address = 1
+
+        def __call__(self, type_id, param_list):
+            return _python_scale_unit_ellipsoid(type_id, param_list)
+
+    move = ShapeSpace(callback=AddressedCallback())
+    assert not move.compiled_callback
+
+
 def test_elastic_shape_move(simulation_factory, two_particle_snapshot_factory):
 
     mc = hoomd.hpmc.integrate.ConvexPolyhedron()
@@ -15,7 +15,9 @@ from . import _hpmc
 from hoomd.hpmc import integrate
 from hoomd.data.parameterdicts import ParameterDict, TypeParameterDict
 from hoomd.data.typeparam import TypeParameter
+from hoomd.logging import log
 import numpy
+from types import MappingProxyType
 
 
 class ShapeMove(_HOOMDBaseObject):
@@ -48,7 +50,7 @@ class ShapeMove(_HOOMDBaseObject):
                                                 step_size, len_keys=1))
         self._add_typeparam(typeparam_step_size)
 
-    def _attach(self):
+    def _attach_hook(self):
         integrator = self._simulation.operations.integrator
         if not isinstance(integrator, integrate.HPMCIntegrator):
             raise RuntimeError("The integrator must be a HPMC integrator.")
@@ -56,15 +58,15 @@ class ShapeMove(_HOOMDBaseObject):
             raise RuntimeError("Integrator is not attached yet.")
 
         integrator_name = integrator.__class__.__name__
-        if integrator_name in self._suported_shapes:
-            self._move_cls = getattr(_hpmc,
-                                     self.__class__.__name__ + integrator_name)
-        else:
+        if integrator_name not in self._suported_shapes:
             raise RuntimeError("Integrator not supported")
+        try:
+            self._move_cls = _move_dispatch[(type(self), type(integrator))]
+        except KeyError as err:
+            raise RuntimeError("Integrator not supported") from err
         self._cpp_obj = self._move_cls(
             self._simulation.state._cpp_sys_def,
             self._simulation.operations.integrator._cpp_obj)
-        super()._attach()
 
 
 class Elastic(ShapeMove):
@@ -141,15 +143,20 @@ class Elastic(ShapeMove):
         shape.name = "reference_shape"
         return shape
 
-    def _attach(self):
+    def _attach_hook(self):
         integrator = self._simulation.operations.integrator
         if isinstance(integrator, integrate.Ellipsoid):
-            for shape in integrator.shape.values():
-                is_sphere = numpy.allclose((shape["a"], shape["b"], shape["c"]),
-                                           shape["a"])
-                if not is_sphere:
-                    raise ValueError("This updater only works when a=b=c.")
-        super()._attach()
+            shapes = integrator.shape
+            abc = numpy.fromiter((value for shape in shapes.values()
+                                  for value in (shape["a"], shape["b"],
+                                                shape["c"])),
+                                 dtype=numpy.float64,
+                                 count=3 * len(shapes)).reshape(-1, 3)
+            is_sphere = (numpy.isclose(abc[:, 0], abc[:, 1])
+                         & numpy.isclose(abc[:, 0], abc[:, 2]))
+            if not numpy.all(is_sphere):
+                raise ValueError("This updater only works when a=b=c.")
+        super()._attach_hook()
 
 
 class ShapeSpace(ShapeMove):
@@ -161,12 +168,18 @@ class ShapeSpace(ShapeMove):
             parameters as arguments and return a dictionary with the shape
             definition whose keys **must** match the shape definition of the
             integrator: ``callable[[str, list], dict]``. There is no
-            type validation of the callback.
+            type validation of the callback. Alternatively, a compiled
+            callback when ``compiled_callback`` is True (see below).
         default_step_size (`float`, optional): Default maximum size of shape
             trial moves (**default**: None). By default requires setting step
             size for all types.
         param_move_probability (`float`, optional): Average fraction of shape
             parameters to change each timestep (**default**: 1).
+        output_size (`int`, optional): Maximum number of values a compiled
+            callback writes to its output buffer (**default**: 0). Must be set
+            when using a compiled callback.
+        compiled_callback (`bool`, optional): Set to True when ``callback``
+            is a compiled C function (**default**: False).
     .. rubric:: Shape support.
     The following shapes are supported:
     * `hoomd.hpmc.integrate.ConvexPolyhedron`
@@ -180,6 +193,10 @@ class ShapeSpace(ShapeMove):
         and 1. The class does not performs any consistency checks internally.
         Therefore, any shape constraint (e.g. constant volume, etc) must be
         performed within the callback.
+    Tip:
+        Return ``vertices`` as a contiguous ``(N_vertices, 3)``
+        `numpy.ndarray` of ``float64``. The vertices are then read directly
+        from the array buffer instead of converting every vertex one by one.
     Example::
         mc = hoomd.hpmc.integrate.ConvexPolyhedron()
         mc.shape["A"] = dict(vertices=[(1, 1, 1), (-1, -1, 1),
@@ -192,6 +209,41 @@ class ShapeSpace(ShapeMove):
                 # do something with params and define verts
                 return dict("vertices":verts, **self.default_dict))
         move = hpmc.shape_move.ShapeSpace(callback = ExampleCallback)
+
+    .. rubric:: Compiled callbacks
+
+    With ``compiled_callback=True``, the callback must be a compiled C
+    function, such as one created with `numba.cfunc`, that exposes its address
+    as an integer ``address`` attribute. The C++ code calls it directly
+    without calling into the Python interpreter. The function signature must be
+    ``void(int32, float64*, int32, float64*, int32*)``: it receives the type
+    id, the parameters and their number, and writes the shape definition to
+    the output buffer together with the number of values written. The
+    function must not write more than ``output_size`` values. For
+    `hoomd.hpmc.integrate.ConvexPolyhedron` and
+    `hoomd.hpmc.integrate.ConvexSpheropolyhedron` the output holds the vertex
+    coordinates (3 values per vertex), for `hoomd.hpmc.integrate.Ellipsoid`
+    the semi-axes ``a``, ``b``, and ``c``. Example::
+
+        import numba
+
+        @numba.cfunc("void(int32, float64*, int32, float64*, int32*)",
+                     cache=True)
+        def scale_tetrahedron(type_id, params, n_params, output, n_output):
+            verts = ((1, 1, 1), (-1, -1, 1), (1, -1, -1), (-1, 1, -1))
+            for i in range(4):
+                for j in range(3):
+                    output[3 * i + j] = params[0] * verts[i][j]
+            n_output[0] = 12
+
+        move = hpmc.shape_move.ShapeSpace(callback=scale_tetrahedron,
+                                          output_size=12,
+                                          compiled_callback=True)
+
+    Warning:
+        The address of a compiled callback is called without any check of
+        the function signature. A wrong signature or an output buffer overrun
+        crashes the program.
     Attributes:
         callback (``callable`` [`str`, `list`], `dict` ]): The python function
             that will be called to map the given shape parameters to a shape
@@ -206,6 +258,8 @@ class ShapeSpace(ShapeMove):
             dimension of the shape space for each particle type.
         param_move_probability (`float`, optional): Average fraction of shape
             parameters to change each timestep (**default**: 1).
+        output_size (`int`): Maximum number of values a compiled callback
+            writes to its output buffer.
     """
 
     _suported_shapes = {
@@ -215,10 +269,15 @@ class ShapeSpace(ShapeMove):
     def __init__(self,
                  callback,
                  default_step_size=None,
-                 param_move_probability=1):
+                 param_move_probability=1,
+                 output_size=0,
+                 compiled_callback=False):
         super().__init__(default_step_size)
+        self._compiled_callback = bool(compiled_callback)
+        self._validate_callback(callback, output_size)
         param_dict = ParameterDict(
             param_move_probability=float(param_move_probability),
+            output_size=int(output_size),
             callback=object)
         param_dict["callback"] = callback
         self._param_dict.update(param_dict)
@@ -228,6 +287,75 @@ class ShapeSpace(ShapeMove):
                                               param_dict=TypeParameterDict(
                                                   [float], len_keys=1))
         self._add_typeparam(typeparam_shapeparams)
+        self._type_params_cache = None
+        self._type_params_revision = None
+
+    @property
+    def compiled_callback(self):
+        """bool: True when ``callback`` is a compiled C function.
+
+        Can only be set on construction.
+        """
+        return self._compiled_callback
+
+    def _attach_hook(self):
+        # validate before creating the C++ object to not leave it half set
+        self._validate_callback(self.callback, self.output_size)
+        super()._attach_hook()
+        self._type_params_cache = None
+
+    def _apply_param_dict(self):
+        super()._apply_param_dict()
+        # setting the python callback in C++ clears the compiled one
+        self._apply_raw_callback()
+
+    def _setattr_param(self, attr, value):
+        if attr == "callback":
+            self._validate_callback(value, self.output_size)
+        elif attr == "output_size":
+            self._validate_callback(self.callback, value)
+        super()._setattr_param(attr, value)
+        # setting the python callback in C++ clears the compiled one
+        if attr == "callback" and self._attached:
+            self._apply_raw_callback()
+
+    def _validate_callback(self, callback, output_size):
+        if not self._compiled_callback:
+            return
+        address = getattr(callback, "address", None)
+        if not isinstance(address, int) or address == 0:
+            raise ValueError("Compiled callbacks must expose the address of "
+                             f"the C function as an int, got {callback}.")
+        if int(output_size) <= 0:
+            raise ValueError("output_size must be set for compiled callbacks.")
+
+    def _apply_raw_callback(self):
+        # C++ calls the compiled function in place of the python callback
+        if self._compiled_callback:
+            self._cpp_obj.setRawCallback(self.callback.address)
+
+    @log(category='object', requires_run=True)
+    def type_params(self):
+        """Mapping[str, numpy.ndarray]: Current shape parameters of each type.
+
+        The parameters are only read from C++ again after they change, either
+        from `params` or from a trial move that changed them (and its
+        rejection). The mapping and its arrays are read-only, use `params` to
+        modify the parameters.
+        """
+        revision = self._cpp_obj.params_revision
+        if (self._type_params_cache is None
+                or self._type_params_revision != revision):
+            cache = {}
+            for typ in self._simulation.state.particle_types:
+                arr = numpy.array(self._cpp_obj.getParams(typ),
+                                  dtype=numpy.float64)
+                arr.flags.writeable = False
+                cache[typ] = arr
+            self._type_params_cache = cache
+            self._type_params_revision = revision
+        # read-only view of the cache, does not copy
+        return MappingProxyType(self._type_params_cache)
 
 
 class Vertex(ShapeMove):
@@ -347,6 +475,16 @@ class Biased(ShapeMove):
                                          param_dict=TypeParameterDict(
                                              float, len_keys=1))
         self._add_typeparam(typeparam_volume)
-        
 
 
+def _build_move_dispatch():
+    """Map (shape move class, integrator class) to the templated C++ class."""
+    dispatch = {}
+    for move_cls in (Elastic, ShapeSpace, Vertex, Biased):
+        for shape in move_cls._suported_shapes:
+            dispatch[(move_cls, getattr(integrate, shape))] = getattr(
+                _hpmc, move_cls.__name__ + shape)
+    return dispatch
+
+
+_move_dispatch = _build_move_dispatch()